@@ -0,0 +1,242 @@
+import asyncio
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from process_log_files import process_log_data
+
+# Column names of a log line, the same as the header row of log.csv
+LOG_HEADER = "Time,Endpoint,HTTPMethod,Login,IPAddr,ResponseMS,ResponseCode\n"
+
+# How many bytes to read from a file or socket at a time
+READ_SIZE = 64 * 1024
+
+
+def process_batch(lines, top_k=None):
+    """
+    Turns one batch of raw log lines into columns and cleans them.
+    This runs in a worker thread or process, not in the asyncio event loop.
+
+    Args:
+        lines (list): Log lines (str), each ending with a newline
+        top_k (int): If given, only keep this many of the newest errors
+
+    Returns:
+        DataFrame: Result of process_log_data for this batch
+    """
+    log_data = pd.read_csv(io.StringIO(LOG_HEADER + ''.join(lines)))
+    log_data = process_log_data(log_data)
+    if top_k is not None:
+        log_data = log_data.head(top_k)
+    return log_data
+
+
+def merge_results(frames, top_k=None):
+    """Combines the cleaned batches, newest errors first"""
+    if not frames:
+        return process_batch([], top_k)
+    log_data = pd.concat(frames, ignore_index=True)
+    log_data = log_data.sort_values(by='Time', ascending=False)
+    if top_k is not None:
+        log_data = log_data.head(top_k)
+    return log_data
+
+
+class LineBatcher:
+    """
+    Collects lines from every source into batches of exactly batch_size lines.
+    Full batches go into an asyncio.Queue with a maximum size, so when the
+    workers fall behind, the sources wait before reading more (backpressure).
+
+    Only one source at a time may send batches. The others wait for their
+    turn with their lines still in the shared buffer, so at most one full
+    batch is ever waiting outside the queue. The buffer itself can still
+    hold up to one batch plus the last chunk read by each source.
+    """
+
+    def __init__(self, queue, batch_size):
+        self.queue = queue
+        self.batch_size = batch_size
+        self.lines = []
+        self.sending = asyncio.Lock()
+
+    async def add_lines(self, lines):
+        """
+        Adds lines from a source, skipping header rows and blank lines.
+        Returns once the shared buffer holds less than one full batch,
+        so the source can read its next chunk.
+        """
+        for line in lines:
+            if not line.strip() or line.startswith('Time,'):
+                continue
+            if not line.endswith('\n'):
+                line += '\n'
+            self.lines.append(line)
+        async with self.sending:
+            while len(self.lines) >= self.batch_size:
+                batch = self.lines[:self.batch_size]
+                self.lines = self.lines[self.batch_size:]
+                await self.queue.put(batch)
+
+    async def flush(self):
+        """Sends the last, partly filled batch"""
+        async with self.sending:
+            if self.lines:
+                batch, self.lines = self.lines, []
+                await self.queue.put(batch)
+
+
+async def read_file_source(path, batcher):
+    """Reads a log file in chunks, using a thread so the event loop never blocks"""
+    with open(path) as log_file:
+        while True:
+            lines = await asyncio.to_thread(log_file.readlines, READ_SIZE)
+            if not lines:
+                break
+            await batcher.add_lines(lines)
+
+
+async def read_stream_source(reader, batcher, writer=None):
+    """Reads log lines from an asyncio StreamReader (TCP or Unix socket)"""
+    leftover = b''
+    try:
+        while True:
+            chunk = await reader.read(READ_SIZE)
+            if not chunk:
+                break
+            # Only pass on complete lines and keep the rest for the next chunk
+            complete, _, leftover = (leftover + chunk).rpartition(b'\n')
+            if complete:
+                await batcher.add_lines(complete.decode().split('\n'))
+        if leftover:
+            await batcher.add_lines([leftover.decode()])
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+async def read_source(source, batcher):
+    """
+    Reads one source. A source can be:
+    - a file path (str or os.PathLike)
+    - a (host, port) tuple for a TCP socket
+    - an asyncio.StreamReader, for example from asyncio.open_unix_connection()
+    """
+    if isinstance(source, asyncio.StreamReader):
+        await read_stream_source(source, batcher)
+    elif isinstance(source, tuple):
+        reader, writer = await asyncio.open_connection(*source)
+        await read_stream_source(reader, batcher, writer)
+    else:
+        await read_file_source(source, batcher)
+
+
+async def ingest_log_sources(sources, batch_size=10000, top_k=None,
+                             max_pending_batches=4, executor=None, workers=None):
+    """
+    Reads many log sources at the same time and cleans them in batches.
+
+    Args:
+        sources (list): File paths, (host, port) tuples, or StreamReaders
+        batch_size (int): Number of lines in each batch
+        top_k (int): If given, only keep this many of the newest errors
+        max_pending_batches (int): Most full batches allowed to wait for a worker.
+            Memory use stays around (max_pending_batches + workers + 2) batches,
+            plus at most one read chunk (READ_SIZE bytes) per source.
+        executor: A concurrent.futures thread or process pool to run batches in.
+            A ThreadPoolExecutor is created (and shut down) if none is given.
+        workers (int): Number of batches processed at the same time
+
+    Returns:
+        DataFrame: Time, Login, ResponseCode, and HTTPCall of the 500 errors,
+                   newest first, from all sources
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    own_executor = executor is None
+    if own_executor:
+        executor = ThreadPoolExecutor(max_workers=workers)
+
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue(maxsize=max_pending_batches)
+    batcher = LineBatcher(queue, batch_size)
+    results = []
+
+    async def consume():
+        while True:
+            batch = await queue.get()
+            if batch is None:
+                return
+            frame = await loop.run_in_executor(executor, process_batch, batch, top_k)
+            results.append(frame)
+            # Keep only the newest top_k rows so results don't keep growing.
+            # The merge runs in the executor so the event loop keeps reading.
+            if top_k is not None and len(results) > workers:
+                frames = results[:]
+                results.clear()
+                results.append(await loop.run_in_executor(executor, merge_results, frames, top_k))
+
+    # Every source gets its own task, so they can all be cancelled if one fails
+    readers = [asyncio.create_task(read_source(source, batcher)) for source in sources]
+
+    async def produce():
+        await asyncio.gather(*readers)
+        await batcher.flush()
+        # One "stop" message for each consumer
+        for _ in range(workers):
+            await queue.put(None)
+
+    # If any reader or worker fails, stop everything instead of waiting forever
+    tasks = readers + [asyncio.create_task(produce())]
+    tasks += [asyncio.create_task(consume()) for _ in range(workers)]
+    try:
+        await asyncio.gather(*tasks)
+        return await loop.run_in_executor(executor, merge_results, results, top_k)
+    finally:
+        for task in tasks:
+            task.cancel()
+        # Wait until the cancelled tasks have closed their files and sockets
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if own_executor:
+            executor.shutdown()
+
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    # Throughput demo: 100 sources at once, 90 log files and 10 TCP sockets
+    lines_per_source = 20000
+    rows = [f"{t},/api/data,POST,\"user{t % 7}\",115.91.249.15,432,{500 if t % 3 == 0 else 200}\n"
+            for t in range(lines_per_source)]
+    data = LOG_HEADER + ''.join(rows)
+
+    async def serve(reader, writer):
+        writer.write(data.encode())
+        await writer.drain()
+        writer.close()
+
+    async def main(temp_dir):
+        paths = []
+        for i in range(90):
+            path = os.path.join(temp_dir, f"log{i}.csv")
+            with open(path, 'w') as log_file:
+                log_file.write(data)
+            paths.append(path)
+        servers = [await asyncio.start_server(serve, '127.0.0.1', 0) for _ in range(10)]
+        sockets = [server.sockets[0].getsockname()[:2] for server in servers]
+
+        start = time.perf_counter()
+        log_data = await ingest_log_sources(paths + sockets, top_k=1000)
+        seconds = time.perf_counter() - start
+        for server in servers:
+            server.close()
+
+        total = 100 * lines_per_source
+        print(f"Read {total} lines from 100 sources in {seconds:.2f}s "
+              f"({total / seconds:,.0f} lines/s)")
+        print(log_data.head())
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        asyncio.run(main(temp_dir))
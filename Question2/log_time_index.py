@@ -0,0 +1,256 @@
+import io
+import json
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from process_log_files import process_log_data
+
+# Number of log lines in each block of the index
+BLOCK_SIZE = 1000
+
+# Change this if the index file layout changes, so old index files get rebuilt
+INDEX_VERSION = 2
+
+# How many bytes before indexed_bytes are saved to check that the file is still the same one
+FINGERPRINT_SIZE = 64
+
+
+def index_path(log_path):
+    """The index is saved next to the log file, for example log.csv.idx"""
+    return str(log_path) + '.idx'
+
+
+def empty_index(log_path, block_size):
+    """An index with no blocks yet, starting right after the header row"""
+    with open(log_path, 'rb') as log_file:
+        header = log_file.readline()
+    return {
+        'version': INDEX_VERSION,
+        'block_size': block_size,
+        'header': header.decode(),
+        # Everything before this byte offset is already in the index
+        'indexed_bytes': len(header),
+        # Which file was indexed and the bytes just before indexed_bytes,
+        # to notice when the log file was replaced (for example rotated)
+        'inode': os.stat(log_path).st_ino,
+        'fingerprint': header[-FINGERPRINT_SIZE:].hex(),
+        # Response codes seen so far. Bit i of a block's code mask means codes[i] is in the block.
+        'codes': [],
+        # One entry per block in each of these lists
+        'offsets': [],
+        'rows': [],
+        'min_times': [],
+        'max_times': [],
+        'code_masks': [],
+    }
+
+
+def load_index(log_path):
+    """Loads the saved index, or returns None if there isn't one"""
+    try:
+        with open(index_path(log_path)) as f:
+            index = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+    if index.get('version') != INDEX_VERSION:
+        return None
+    return index
+
+
+def save_index(log_path, index):
+    """
+    Saves the index, replacing the old file only once the new one is written.
+    Each save uses its own temporary file, so several processes can save at once.
+    """
+    directory = os.path.dirname(os.path.abspath(index_path(log_path)))
+    handle, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(handle, 'w') as f:
+            json.dump(index, f)
+        os.replace(temp_path, index_path(log_path))
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+
+def read_fingerprint(log_path, end):
+    """The (up to) FINGERPRINT_SIZE bytes just before byte offset end, as hex"""
+    start = max(0, end - FINGERPRINT_SIZE)
+    with open(log_path, 'rb') as log_file:
+        log_file.seek(start)
+        return log_file.read(end - start).hex()
+
+
+def index_matches_file(index, log_path, block_size, header):
+    """True if the saved index belongs to this log file and it was only appended to"""
+    return (index['block_size'] == block_size
+            and index['header'] == header
+            and index['inode'] == os.stat(log_path).st_ino
+            and os.path.getsize(log_path) >= index['indexed_bytes']
+            and read_fingerprint(log_path, index['indexed_bytes']) == index['fingerprint'])
+
+
+def add_block(index, offset, times, codes):
+    """Adds one block's summary to the index"""
+    mask = 0
+    for code in set(codes):
+        if code not in index['codes']:
+            index['codes'].append(code)
+        mask |= 1 << index['codes'].index(code)
+    index['offsets'].append(offset)
+    index['rows'].append(len(times))
+    index['min_times'].append(min(times))
+    index['max_times'].append(max(times))
+    index['code_masks'].append(mask)
+
+
+def update_index(log_path, block_size=BLOCK_SIZE):
+    """
+    Brings the index up to date with the log file and saves it if it changed.
+    If lines were only added to the end of the file, just the new lines
+    (and the last, partly filled block) are read again.
+
+    Args:
+        log_path (str): Path of the log file
+        block_size (int): Number of log lines in each block
+
+    Returns:
+        dict: The updated index
+
+    Raises:
+        ValueError: If the header has no Time or ResponseCode column, or a line
+                    doesn't match the header (for example a comma inside a field)
+    """
+    index = load_index(log_path)
+    saved = json.dumps(index)
+    with open(log_path, 'rb') as log_file:
+        header = log_file.readline().decode()
+
+    # Find the Time and ResponseCode columns from the header row
+    columns = header.strip().split(',')
+    if header and ('Time' not in columns or 'ResponseCode' not in columns):
+        raise ValueError("The header row needs a Time and a ResponseCode column")
+    time_column = columns.index('Time') if header else 0
+    code_column = columns.index('ResponseCode') if header else 0
+
+    # Start over if there is no index or the file was replaced instead of appended to
+    if index is None or not index_matches_file(index, log_path, block_size, header):
+        index = empty_index(log_path, block_size)
+
+    # The last block may not be full yet, so remove it and read it again
+    start = index['indexed_bytes']
+    if index['rows'] and index['rows'][-1] < block_size:
+        start = index['offsets'][-1]
+        for key in ['offsets', 'rows', 'min_times', 'max_times', 'code_masks']:
+            index[key].pop()
+
+    with open(log_path, 'rb') as log_file:
+        log_file.seek(start)
+        offset = start
+        block_offset = start
+        times = []
+        codes = []
+        for line in log_file:
+            # A line without a newline may still be being written, so it isn't
+            # indexed yet (find_errors_in_time_range reads it separately)
+            if not line.endswith(b'\n'):
+                break
+            if line.strip():
+                fields = line.split(b',')
+                if len(fields) != len(columns):
+                    raise ValueError(f"The line at byte {offset} doesn't match the header row")
+                times.append(int(fields[time_column]))
+                codes.append(int(fields[code_column]))
+            offset += len(line)
+            if len(times) == block_size:
+                add_block(index, block_offset, times, codes)
+                block_offset = offset
+                times = []
+                codes = []
+        if times:
+            add_block(index, block_offset, times, codes)
+        index['indexed_bytes'] = offset
+    index['fingerprint'] = read_fingerprint(log_path, offset)
+
+    # Only write the index when something changed. If the folder can't be
+    # written to, queries still work, they just rebuild the index each time.
+    if json.dumps(index) != saved:
+        try:
+            save_index(log_path, index)
+        except OSError:
+            pass
+    return index
+
+
+def scan_whole_file(log_path, start_time, end_time):
+    """The slow way: read the whole log file and keep the rows in the window"""
+    log_data = pd.read_csv(log_path)
+    log_data = log_data[(log_data['Time'] >= start_time) & (log_data['Time'] <= end_time)]
+    return process_log_data(log_data)
+
+
+def find_errors_in_time_range(log_path, start_time, end_time, block_size=BLOCK_SIZE):
+    """
+    Finds the 500 errors with start_time <= Time <= end_time without reading
+    the whole log file. Only blocks whose Time range overlaps the window and
+    that contain at least one 500 are read, plus any last line that has no
+    newline yet. If the file can't be indexed, the whole file is read instead.
+
+    Args:
+        log_path (str): Path of the log file
+        start_time (int): First Time to include
+        end_time (int): Last Time to include
+        block_size (int): Number of log lines in each block of the index
+
+    Returns:
+        DataFrame: Same columns as process_log_data, newest errors first
+    """
+    try:
+        index = update_index(log_path, block_size)
+    except ValueError:
+        # Lines the index can't read, so give the same answer the slow way
+        return scan_whole_file(log_path, start_time, end_time)
+    header = index['header']
+    if not header:
+        # An empty log file (not even a header row) has no errors
+        return pd.DataFrame(columns=['Time', 'Login', 'ResponseCode', 'HTTPCall'])
+    if not header.endswith('\n'):
+        header += '\n'
+
+    # Pick the blocks that could have matching rows
+    wanted = ((np.array(index['max_times'], dtype=np.int64) >= start_time) &
+              (np.array(index['min_times'], dtype=np.int64) <= end_time))
+    if 500 in index['codes']:
+        bit = 1 << index['codes'].index(500)
+        wanted &= np.array([mask & bit != 0 for mask in index['code_masks']], dtype=bool)
+    else:
+        wanted[:] = False
+
+    # Each block ends where the next one starts (the last one at indexed_bytes)
+    ends = index['offsets'][1:] + [index['indexed_bytes']]
+    chunks = []
+    with open(log_path, 'rb') as log_file:
+        for block in np.flatnonzero(wanted):
+            log_file.seek(index['offsets'][block])
+            chunks.append(log_file.read(ends[block] - index['offsets'][block]))
+        # With no matching blocks, still read one line so the columns get the right types.
+        # It can't be a match, otherwise its block would have been picked.
+        if not chunks and index['offsets']:
+            log_file.seek(index['offsets'][0])
+            chunks.append(log_file.readline())
+        # Lines after indexed_bytes (like a last line without a newline) aren't in
+        # the index yet, so read them too. A full scan would include them as well.
+        log_file.seek(index['indexed_bytes'])
+        chunks.append(log_file.read())
+
+    log_data = pd.read_csv(io.StringIO(header + b''.join(chunks).decode()))
+    log_data = log_data[(log_data['Time'] >= start_time) & (log_data['Time'] <= end_time)]
+    return process_log_data(log_data)
+
+
+if __name__ == "__main__":
+    # Example: 500 errors between Time 17600 and 17630 in the sample log file
+    print(find_errors_in_time_range('log.csv', 17600, 17630))
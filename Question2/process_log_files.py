@@ -1,49 +1,45 @@
 import pandas as pd
 
-# Step 1: Load the log file into a data frame
-log_data = pd.read_csv('log.csv')
+def process_log_data(log_data):
+    """
+    Runs Steps 2-6 on an already loaded log data frame.
+    Other scripts (like ingest_log_streams.py) use this so they clean
+    the logs exactly the same way.
 
-# Print original data to see what we're working with
-print("Original log data:")
-print(log_data.head())
-print()
+    Args:
+        log_data (DataFrame): Log data with the columns from log.csv
 
-# Step 2: Remove any rows where Login is empty ("")
-# Make sure we're correctly identifying empty logins
-log_data = log_data[log_data['Login'] != '""']
+    Returns:
+        DataFrame: Time, Login, ResponseCode, and HTTPCall of the 500 errors,
+                   newest first
+    """
+    # Step 2: Remove any rows where Login is empty ("")
+    log_data = log_data[log_data['Login'] != '""']
 
-# Print after removing empty logins
-print("After removing empty logins:")
-print(log_data.head())
-print()
+    # Step 3: Remove any rows where ResponseCode is not 500
+    log_data = log_data[log_data['ResponseCode'] == 500].copy()
 
-# Step 3: Remove any rows where ResponseCode is not 500
-log_data = log_data[log_data['ResponseCode'] == 500]
+    # Step 4: Create a new column HTTPCall that combines HTTPMethod and Endpoint
+    log_data['HTTPCall'] = log_data['HTTPMethod'] + ' ' + log_data['Endpoint']
 
-# Print after filtering for 500 errors
-print("After filtering for 500 errors:")
-print(log_data.head())
-print()
+    # Step 5: Sort the entire data frame by the Time column in descending order
+    log_data = log_data.sort_values(by='Time', ascending=False)
 
-# Step 4: Create a new column HTTPCall that combines HTTPMethod and Endpoint
-log_data['HTTPCall'] = log_data['HTTPMethod'] + ' ' + log_data['Endpoint']
+    # Step 6: Remove all columns except Time, Login, ResponseCode, and HTTPCall
+    return log_data[['Time', 'Login', 'ResponseCode', 'HTTPCall']]
 
-# Print after creating HTTPCall column
-print("After creating HTTPCall column:")
-print(log_data.head())
-print()
+if __name__ == "__main__":
+    # Step 1: Load the log file into a data frame
+    log_data = pd.read_csv('log.csv')
 
-# Step 5: Sort the entire data frame by the Time column in descending order
-log_data = log_data.sort_values(by='Time', ascending=False)
+    # Print original data to see what we're working with
+    print("Original log data:")
+    print(log_data.head())
+    print()
 
-# Print after sorting
-print("After sorting by Time in descending order:")
-print(log_data.head())
-print()
+    # Steps 2-6: clean the data (see process_log_data above for each step)
+    log_data = process_log_data(log_data)
 
-# Step 6: Remove all columns except Time, Login, ResponseCode, and HTTPCall
-log_data = log_data[['Time', 'Login', 'ResponseCode', 'HTTPCall']]
-
-# Print final result
-print("Final cleaned log data:")
-print(log_data.head())
\ No newline at end of file
+    # Print final result
+    print("Final cleaned log data:")
+    print(log_data.head())
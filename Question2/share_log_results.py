@@ -0,0 +1,307 @@
+import ctypes
+import json
+import secrets
+import time
+import weakref
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+import pandas as pd
+
+# Size in bytes of the small control block that holds the version and the descriptor
+CONTROL_SIZE = 64 * 1024
+
+# Each buffer starts at a multiple of this many bytes in the data block
+ALIGNMENT = 64
+
+# Columns of the final log frame and how they are shared.
+# Text columns are stored like Apache Arrow does it: all the strings as UTF-8
+# bytes one after another, plus an offsets array saying where each one starts.
+COLUMN_KINDS = {'Time': 'int', 'Login': 'str', 'ResponseCode': 'int', 'HTTPCall': 'str'}
+
+# Names of the blocks created by publishers in this process
+published_names = set()
+
+# Data blocks whose arrays are all gone, waiting to be closed
+released_blocks = []
+
+
+def attach_shared_memory(name):
+    """
+    Opens an existing shared memory block without taking ownership of it.
+    Before Python 3.13 every process that opens a block also "tracks" it,
+    and would delete it on exit even though the publisher still owns it.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        block = shared_memory.SharedMemory(name=name)
+        # A publisher in this same process is already tracking it, so leave that alone
+        if name not in published_names:
+            resource_tracker.unregister(block._name, 'shared_memory')
+        return block
+
+
+def close_released_blocks():
+    """Closes the data blocks that no array points into anymore"""
+    while released_blocks:
+        released_blocks.pop().close()
+
+
+def column_buffers(log_data):
+    """
+    Turns the log frame into the NumPy arrays that get shared.
+    Number columns become one int64 array. Text columns become two arrays,
+    'Column.offsets' and 'Column.data' (see StringColumn).
+    """
+    buffers = {}
+    for column, kind in COLUMN_KINDS.items():
+        if kind == 'int':
+            buffers[column] = log_data[column].to_numpy(dtype=np.int64)
+        else:
+            # Missing values (like an empty Login) are shared as ''. A column read_csv
+            # gave numbers (all-empty or numeric Logins) is turned into text first.
+            encoded = [value.encode() for value in log_data[column].fillna('').astype(str)]
+            lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+            buffers[column + '.offsets'] = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64)
+            buffers[column + '.data'] = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+    return buffers
+
+
+class StringColumn:
+    """
+    A text column read from shared memory without copying.
+    String i is data[offsets[i]:offsets[i + 1]] decoded from UTF-8.
+    """
+
+    def __init__(self, offsets, data):
+        self.offsets = offsets
+        self.data = data
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        return self.data[self.offsets[i]:self.offsets[i + 1]].tobytes().decode()
+
+    def tolist(self):
+        """All the strings as a Python list (this copies them)"""
+        data = self.data.tobytes()
+        offsets = self.offsets.tolist()
+        return [data[start:end].decode() for start, end in zip(offsets, offsets[1:])]
+
+
+class LogResultPublisher:
+    """
+    Publishes the result of process_log_data in shared memory so other
+    processes can read it without copying or pickling.
+
+    Every result gets its own data block with the buffers laid out one after
+    another. The control block (called name) holds a counter and a small JSON
+    descriptor of the newest data block. The counter is odd while a new
+    descriptor is being written, so readers can tell when they must retry.
+
+    If a publisher stops without close() and a new one starts with the same
+    name, the new one takes over the control block and keeps counting from there.
+    """
+
+    def __init__(self, name, keep_versions=2):
+        self.name = name
+        # Older blocks are kept for a while, since a reader may still be opening one
+        self.keep_versions = keep_versions
+        # Data block names are unique per run, so leftovers from a crashed run can't clash
+        self.run = secrets.token_hex(4)
+        self.blocks = []
+        try:
+            self.control = shared_memory.SharedMemory(name=name, create=True, size=CONTROL_SIZE)
+            created = True
+        except FileExistsError:
+            self.control = shared_memory.SharedMemory(name=name)
+            created = False
+        published_names.add(name)
+        self.header = np.ndarray((2,), dtype=np.int64, buffer=self.control.buf)
+        if created:
+            self.header[:] = 0
+        elif self.header[0] % 2 == 1:
+            # The old publisher stopped while writing, so clear the half written descriptor
+            self.header[1] = 0
+            self.header[0] += 1
+        elif self.header[1]:
+            # Take over the newest old block so it gets removed like our own
+            start = self.header.nbytes
+            descriptor = json.loads(bytes(self.control.buf[start:start + int(self.header[1])]))
+            try:
+                self.blocks.append(shared_memory.SharedMemory(name=descriptor['block']))
+                published_names.add(descriptor['block'])
+            except FileNotFoundError:
+                pass
+        self.version = int(self.header[0]) // 2
+
+    def publish(self, log_data):
+        """
+        Copies the frame into a new shared memory block and makes it the current result.
+
+        Args:
+            log_data (DataFrame): Output of process_log_data
+
+        Returns:
+            dict: The descriptor readers use to find the columns
+        """
+        arrays = column_buffers(log_data)
+
+        # Work out where each buffer goes in the data block
+        buffers = []
+        offset = 0
+        for name, array in arrays.items():
+            buffers.append({'name': name, 'dtype': array.dtype.str,
+                            'length': len(array), 'offset': offset})
+            offset += -(-array.nbytes // ALIGNMENT) * ALIGNMENT
+
+        version = self.version + 1
+        block = shared_memory.SharedMemory(name=f"{self.name}_{self.run}_{version}",
+                                           create=True, size=max(offset, 1))
+        published_names.add(block.name)
+        for info in buffers:
+            array = arrays[info['name']]
+            block.buf[info['offset']:info['offset'] + array.nbytes] = array.tobytes()
+
+        descriptor = {'version': version, 'block': block.name,
+                      'rows': len(log_data), 'buffers': buffers}
+        data = json.dumps(descriptor).encode()
+        if len(data) > CONTROL_SIZE - self.header.nbytes:
+            raise ValueError("Descriptor does not fit in the control block")
+
+        # Odd counter means "being written"
+        self.header[0] += 1
+        self.header[1] = len(data)
+        self.control.buf[self.header.nbytes:self.header.nbytes + len(data)] = data
+        self.header[0] += 1
+        self.version = version
+
+        # Remove blocks that are too old for anyone to still be opening
+        self.blocks.append(block)
+        while len(self.blocks) > self.keep_versions:
+            old = self.blocks.pop(0)
+            old.close()
+            old.unlink()
+            published_names.discard(old.name)
+        return descriptor
+
+    def close(self):
+        """Removes the control block and all data blocks"""
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+            published_names.discard(block.name)
+        self.blocks = []
+        del self.header
+        self.control.close()
+        self.control.unlink()
+        published_names.discard(self.name)
+
+
+class LogResultReader:
+    """
+    Reads results published by LogResultPublisher in another process.
+    The columns from read() point straight into shared memory (no copy).
+    Each data block stays open for as long as any array from it exists,
+    even after a newer read() or close().
+    """
+
+    def __init__(self, name):
+        self.control = attach_shared_memory(name)
+        self.header = np.ndarray((2,), dtype=np.int64, buffer=self.control.buf)
+        self.version = 0
+
+    def latest_version(self):
+        """The version of the newest published result (0 if nothing is published yet)"""
+        return int(self.header[0]) // 2
+
+    def has_new_result(self):
+        """True if a newer result was published since the last read()"""
+        return self.latest_version() > self.version
+
+    def read_descriptor(self, timeout=1.0):
+        """Reads the descriptor, retrying while the publisher is writing a new one"""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            before = int(self.header[0])
+            if before % 2 == 0:
+                length = int(self.header[1])
+                data = bytes(self.control.buf[self.header.nbytes:self.header.nbytes + length])
+                if int(self.header[0]) == before:
+                    return json.loads(data) if length else None
+            time.sleep(0.001)
+        raise TimeoutError("Publisher did not finish writing the descriptor")
+
+    def read(self):
+        """
+        Opens the newest result.
+
+        Returns:
+            dict: Column name -> NumPy array (numbers) or StringColumn (text),
+                  viewing the shared memory, or None if nothing is published yet
+        """
+        close_released_blocks()
+        while True:
+            descriptor = self.read_descriptor()
+            if descriptor is None:
+                return None
+            try:
+                block = attach_shared_memory(descriptor['block'])
+                break
+            except FileNotFoundError:
+                # The publisher already removed it, so a newer result is out
+                continue
+        self.version = descriptor['version']
+
+        # Every array below is built on top of this ctypes object, so it stays
+        # alive while any of them (or any slice of them) does. While it is alive
+        # it holds on to the block's memory, so the block can't be unmapped.
+        memory = (ctypes.c_char * len(block.buf)).from_buffer(block.buf)
+        # Once it is gone, close the block the next time the reader is used
+        weakref.finalize(memory, released_blocks.append, block)
+
+        buffers = {}
+        for info in descriptor['buffers']:
+            buffers[info['name']] = np.frombuffer(memory, dtype=info['dtype'],
+                                                  count=info['length'], offset=info['offset'])
+        arrays = {}
+        for column, kind in COLUMN_KINDS.items():
+            if kind == 'int':
+                arrays[column] = buffers[column]
+            else:
+                arrays[column] = StringColumn(buffers[column + '.offsets'], buffers[column + '.data'])
+        return arrays
+
+    def read_frame(self):
+        """Reads the newest result as a DataFrame (this one copies the data)"""
+        arrays = self.read()
+        if arrays is None:
+            return None
+        log_data = pd.DataFrame({column: array.copy() if isinstance(array, np.ndarray)
+                                 else array.tolist() for column, array in arrays.items()})
+        del arrays
+        for column, kind in COLUMN_KINDS.items():
+            if kind == 'str':
+                log_data[column] = log_data[column].replace('', np.nan)
+        return log_data
+
+    def close(self):
+        """Detaches from the control block (the publisher still owns everything)"""
+        close_released_blocks()
+        del self.header
+        self.control.close()
+
+
+if __name__ == "__main__":
+    from process_log_files import process_log_data
+
+    # Publish the cleaned sample log, then read it back as a consumer would
+    publisher = LogResultPublisher('log_results')
+    publisher.publish(process_log_data(pd.read_csv('log.csv')))
+    reader = LogResultReader('log_results')
+    print(f"Version {reader.latest_version()}:")
+    print(reader.read_frame())
+    reader.close()
+    publisher.close()
@@ -0,0 +1,176 @@
+import unittest
+import asyncio
+import os
+import tempfile
+import pandas as pd
+from process_log_files import process_log_data
+from ingest_log_streams import ingest_log_sources, LineBatcher
+
+class TestLogStreamIngestion(unittest.TestCase):
+    """
+    Unit tests for reading many log sources at the same time.
+    Checks that the result matches processing one combined log file.
+    """
+
+    def setUp(self):
+        """Create a few test log files"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.paths = []
+        for i in range(3):
+            path = os.path.join(self.temp_dir.name, f"log{i}.csv")
+            with open(path, 'w') as f:
+                f.write("Time,Endpoint,HTTPMethod,Login,IPAddr,ResponseMS,ResponseCode\n")
+                for t in range(i, 300, 3):
+                    code = 500 if t % 2 == 0 else 200
+                    f.write(f"{t},/page{t % 4},GET,\"user{t % 5}\",115.91.249.13,100,{code}\n")
+            self.paths.append(path)
+
+    def tearDown(self):
+        """Remove the test log files"""
+        self.temp_dir.cleanup()
+
+    def expected_result(self, top_k=None):
+        """Process all test files as one data frame"""
+        log_data = pd.concat([pd.read_csv(path) for path in self.paths])
+        log_data = process_log_data(log_data)
+        if top_k is not None:
+            log_data = log_data.head(top_k)
+        return log_data.reset_index(drop=True)
+
+    def test_files_match_single_frame(self):
+        """Test that reading files in small batches gives the same result"""
+        log_data = asyncio.run(ingest_log_sources(self.paths, batch_size=7, workers=2))
+        pd.testing.assert_frame_equal(log_data.reset_index(drop=True), self.expected_result())
+
+    def test_top_k(self):
+        """Test that only the newest top_k errors are kept"""
+        log_data = asyncio.run(ingest_log_sources(self.paths, batch_size=10, top_k=5))
+        self.assertEqual(log_data['Time'].tolist(), [298, 296, 294, 292, 290])
+
+    def test_tcp_source(self):
+        """Test reading one source from a local TCP socket"""
+        with open(self.paths[0], 'rb') as f:
+            data = f.read()
+
+        async def serve(reader, writer):
+            # Send in small pieces so lines get split across reads
+            for start in range(0, len(data), 50):
+                writer.write(data[start:start + 50])
+                await writer.drain()
+            writer.close()
+
+        async def run():
+            server = await asyncio.start_server(serve, '127.0.0.1', 0)
+            address = server.sockets[0].getsockname()[:2]
+            try:
+                return await ingest_log_sources([address] + self.paths[1:], batch_size=16)
+            finally:
+                server.close()
+
+        log_data = asyncio.run(run())
+        pd.testing.assert_frame_equal(log_data.reset_index(drop=True), self.expected_result())
+
+    def test_backpressure(self):
+        """Test that a full queue makes the sources wait"""
+        async def run():
+            queue = asyncio.Queue(maxsize=1)
+            batcher = LineBatcher(queue, batch_size=2)
+            lines = [f"{t},/a,GET,\"u\",1.1.1.1,1,500\n" for t in range(6)]
+            adding = asyncio.create_task(batcher.add_lines(lines))
+            await asyncio.sleep(0.01)
+            # Nobody is reading the queue, so only one batch fits
+            self.assertFalse(adding.done())
+            self.assertEqual(queue.qsize(), 1)
+            for _ in range(3):
+                self.assertEqual(len(await queue.get()), 2)
+            await adding
+
+        asyncio.run(run())
+
+    def test_backpressure_many_sources(self):
+        """Test that memory stays at one batch plus one chunk per source, not one batch per source"""
+        class CountingQueue(asyncio.Queue):
+            """A queue that remembers how many put() calls waited at the same time"""
+            waiting = 0
+            most_waiting = 0
+
+            async def put(self, item):
+                self.waiting += 1
+                self.most_waiting = max(self.most_waiting, self.waiting)
+                try:
+                    await super().put(item)
+                finally:
+                    self.waiting -= 1
+
+        batch_size = 4
+        chunk_lines = 10
+        source_count = 50
+
+        async def run():
+            queue = CountingQueue(maxsize=1)
+            batcher = LineBatcher(queue, batch_size)
+            sources = [[[f"{s},{c},{t},/a,GET,\"u\",1.1.1.1,1,500\n" for t in range(chunk_lines)]
+                        for c in range(5)] for s in range(source_count)]
+
+            async def read_chunks(chunks):
+                # Like read_file_source: one add_lines call per chunk read
+                for chunk in chunks:
+                    await batcher.add_lines(chunk)
+
+            adding = [asyncio.create_task(read_chunks(chunks)) for chunks in sources]
+            await asyncio.sleep(0.01)
+            # Lines held outside the queue: the shared buffer plus batches waiting in put()
+            held = len(batcher.lines) + queue.waiting * batch_size
+            self.assertEqual(queue.most_waiting, 1)
+            self.assertLessEqual(held, batch_size + source_count * chunk_lines)
+            # Most of the lines haven't been read at all yet
+            total = source_count * 5 * chunk_lines
+            self.assertLess(held + queue.qsize() * batch_size, total // 4)
+
+            # Drain the queue and check that every line arrives once
+            received = []
+            for _ in range(total // batch_size):
+                received += await queue.get()
+            await asyncio.gather(*adding)
+            self.assertEqual(batcher.lines, [])
+            self.assertEqual(sorted(received), sorted(sum(sum(sources, []), [])))
+            self.assertEqual(queue.most_waiting, 1)
+
+        asyncio.run(run())
+
+    def test_failing_source_leaves_no_tasks(self):
+        """Test that when one source fails, the other sources are stopped too"""
+        async def run():
+            # A socket that sends nothing until the test is over
+            stop = asyncio.Event()
+
+            async def wait_for_stop(reader, writer):
+                await stop.wait()
+                writer.close()
+
+            server = await asyncio.start_server(wait_for_stop, '127.0.0.1', 0)
+            address = server.sockets[0].getsockname()[:2]
+            missing = os.path.join(self.temp_dir.name, 'missing.csv')
+            try:
+                with self.assertRaises(FileNotFoundError):
+                    await ingest_log_sources([address] + self.paths + [missing], batch_size=5)
+                left = [task for task in asyncio.all_tasks()
+                        if task.get_coro().__name__ == 'read_source']
+                self.assertEqual(left, [])
+            finally:
+                stop.set()
+                server.close()
+                await server.wait_closed()
+
+        asyncio.run(run())
+
+    def test_many_file_sources(self):
+        """Test 50 sources with a small queue and tiny batches"""
+        paths = self.paths * 17
+        log_data = asyncio.run(ingest_log_sources(paths[:50], batch_size=25,
+                                                  max_pending_batches=1, workers=1, top_k=20))
+        expected = process_log_data(pd.concat([pd.read_csv(path) for path in paths[:50]]))
+        self.assertEqual(log_data['Time'].tolist(), expected['Time'].head(20).tolist())
+
+if __name__ == '__main__':
+    unittest.main()
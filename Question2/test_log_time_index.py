@@ -0,0 +1,149 @@
+import unittest
+import os
+import tempfile
+from unittest import mock
+import pandas as pd
+from process_log_files import process_log_data
+from log_time_index import find_errors_in_time_range, update_index, load_index
+
+class TestLogTimeIndex(unittest.TestCase):
+    """
+    Unit tests for the Time index that lets us read only part of a log file.
+    Compares index queries with processing the whole file.
+    """
+
+    def setUp(self):
+        """Create a test log file with 100 lines"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.log_path = os.path.join(self.temp_dir.name, 'log.csv')
+        with open(self.log_path, 'w') as f:
+            f.write("Time,Endpoint,HTTPMethod,Login,IPAddr,ResponseMS,ResponseCode\n")
+            self.write_lines(f, range(100))
+
+    def tearDown(self):
+        """Remove the test log file and its index"""
+        self.temp_dir.cleanup()
+
+    def write_lines(self, f, times):
+        """Write log lines, with a 500 error on every 7th Time"""
+        for t in times:
+            code = 500 if t % 7 == 0 else 200
+            f.write(f"{t},/page{t % 3},GET,\"user{t % 4}\",115.91.249.13,100,{code}\n")
+
+    def full_scan(self, start_time, end_time):
+        """Find the answer the slow way, by reading the whole file"""
+        log_data = pd.read_csv(self.log_path)
+        log_data = log_data[(log_data['Time'] >= start_time) & (log_data['Time'] <= end_time)]
+        return process_log_data(log_data).reset_index(drop=True)
+
+    def test_query_matches_full_scan(self):
+        """Test that index queries give the same rows as a full scan"""
+        for start_time, end_time in [(0, 99), (10, 20), (14, 14), (50, 1000), (200, 300)]:
+            log_data = find_errors_in_time_range(self.log_path, start_time, end_time, block_size=8)
+            pd.testing.assert_frame_equal(log_data.reset_index(drop=True),
+                                          self.full_scan(start_time, end_time))
+
+    def test_block_summaries(self):
+        """Test the min/max Time and response codes saved for each block"""
+        index = update_index(self.log_path, block_size=10)
+        self.assertEqual(index['rows'], [10] * 10)
+        self.assertEqual(index['min_times'][2], 20)
+        self.assertEqual(index['max_times'][2], 29)
+        # Block 3 (Time 30-39) has a 500 at Time 35
+        bit = 1 << index['codes'].index(500)
+        self.assertTrue(index['code_masks'][3] & bit)
+        # The index was saved next to the log file
+        self.assertEqual(load_index(self.log_path), index)
+
+    def test_blocks_without_500_are_skipped(self):
+        """Test that blocks with no 500 errors do not get their bit set"""
+        index = update_index(self.log_path, block_size=3)
+        bit = 1 << index['codes'].index(500)
+        # Block 1 holds Time 3, 4, 5 and has no 500 errors
+        self.assertFalse(index['code_masks'][1] & bit)
+
+    def test_append_updates_index(self):
+        """Test that lines added to the end of the file are indexed"""
+        update_index(self.log_path, block_size=8)
+        with open(self.log_path, 'a') as f:
+            self.write_lines(f, range(100, 130))
+            # A line that is still being written should wait for the next update
+            f.write("130,/page0,GET")
+        index = update_index(self.log_path, block_size=8)
+        self.assertEqual(sum(index['rows']), 130)
+        self.assertEqual(index['max_times'][-1], 129)
+
+        # Rebuilding from scratch gives the same index
+        os.remove(self.log_path + '.idx')
+        self.assertEqual(update_index(self.log_path, block_size=8), index)
+
+        log_data = find_errors_in_time_range(self.log_path, 95, 129, block_size=8)
+        self.assertEqual(log_data['Time'].tolist(), [126, 119, 112, 105, 98])
+
+    def test_replaced_file_is_reindexed(self):
+        """Test that a new, bigger file with the same name is not read from the old offset"""
+        update_index(self.log_path, block_size=8)
+        # Rotate: the new file has the same line width but different Times
+        os.remove(self.log_path)
+        with open(self.log_path, 'w') as f:
+            f.write("Time,Endpoint,HTTPMethod,Login,IPAddr,ResponseMS,ResponseCode\n")
+            self.write_lines(f, range(300, 500))
+        log_data = find_errors_in_time_range(self.log_path, 0, 1000, block_size=8)
+        pd.testing.assert_frame_equal(log_data.reset_index(drop=True), self.full_scan(0, 1000))
+
+    def test_unchanged_index_is_not_rewritten(self):
+        """Test that queries only save the index when something changed"""
+        find_errors_in_time_range(self.log_path, 0, 50, block_size=8)
+        with mock.patch('log_time_index.save_index') as save_index:
+            find_errors_in_time_range(self.log_path, 10, 20, block_size=8)
+            save_index.assert_not_called()
+        # No temporary files are left behind
+        self.assertEqual(sorted(os.listdir(self.temp_dir.name)), ['log.csv', 'log.csv.idx'])
+
+    def test_folder_not_writable(self):
+        """Test that queries still work when the index can't be saved"""
+        with mock.patch('log_time_index.tempfile.mkstemp', side_effect=PermissionError):
+            log_data = find_errors_in_time_range(self.log_path, 10, 20, block_size=8)
+        pd.testing.assert_frame_equal(log_data.reset_index(drop=True), self.full_scan(10, 20))
+        self.assertIsNone(load_index(self.log_path))
+
+    def test_last_line_without_newline(self):
+        """Test that a last line with no newline is still found, like a full scan finds it"""
+        with open(self.log_path, 'a') as f:
+            f.write("140,/page0,GET,\"user0\",115.91.249.13,100,500")
+        log_data = find_errors_in_time_range(self.log_path, 95, 200, block_size=8)
+        self.assertEqual(log_data['Time'].tolist(), [140, 98])
+        pd.testing.assert_frame_equal(log_data.reset_index(drop=True), self.full_scan(95, 200))
+        # It isn't in the index until its line is finished
+        self.assertEqual(load_index(self.log_path)['max_times'][-1], 99)
+
+    def test_columns_in_other_order(self):
+        """Test that the Time and ResponseCode columns are found from the header row"""
+        with open(self.log_path, 'w') as f:
+            f.write("ResponseCode,Endpoint,HTTPMethod,Login,Time\n")
+            for t in range(50):
+                code = 500 if t % 7 == 0 else 200
+                f.write(f"{code},/page{t % 3},GET,\"user{t % 4}\",{t}\n")
+        log_data = find_errors_in_time_range(self.log_path, 10, 40, block_size=8)
+        self.assertEqual(log_data['Time'].tolist(), [35, 28, 21, 14])
+        pd.testing.assert_frame_equal(log_data.reset_index(drop=True), self.full_scan(10, 40))
+
+    def test_unreadable_line_falls_back_to_full_scan(self):
+        """Test that lines the index can't read give the full scan answer instead of an error"""
+        with open(self.log_path, 'a') as f:
+            # A comma inside quotes is part of the Login, so splitting on commas doesn't work
+            f.write("105,/page0,GET,\"smith, j\",115.91.249.13,100,500\n")
+        log_data = find_errors_in_time_range(self.log_path, 90, 200, block_size=8)
+        self.assertEqual(log_data['Time'].tolist(), [105, 98, 91])
+        pd.testing.assert_frame_equal(log_data.reset_index(drop=True), self.full_scan(90, 200))
+        self.assertIsNone(load_index(self.log_path))
+
+    def test_empty_log_file(self):
+        """Test that an empty log file gives no errors"""
+        open(self.log_path, 'w').close()
+        log_data = find_errors_in_time_range(self.log_path, 0, 100)
+        self.assertEqual(len(log_data), 0)
+        self.assertEqual(list(log_data.columns), ['Time', 'Login', 'ResponseCode', 'HTTPCall'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,6 +2,7 @@ import unittest
 import pandas as pd
 import os
 import tempfile
+from process_log_files import process_log_data
 
 class TestLogFileProcessing(unittest.TestCase):
     """
@@ -159,6 +160,12 @@ class TestLogFileProcessing(unittest.TestCase):
             # Check time is sorted in descending order
             time_values = log_data['Time'].tolist()
             self.assertEqual(time_values, sorted(time_values, reverse=True))
+    
+    def test_process_log_data_function(self):
+        """Test that process_log_data gives the same result as the steps above"""
+        log_data = process_log_data(pd.read_csv(self.temp_file_path))
+        expected = self.process_log_file(self.temp_file_path)
+        pd.testing.assert_frame_equal(log_data, expected)
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,199 @@
+import unittest
+import multiprocessing
+import os
+import gc
+import pandas as pd
+from process_log_files import process_log_data
+import share_log_results
+from share_log_results import LogResultPublisher, LogResultReader
+
+def read_in_other_process(name, queue):
+    """Runs in a separate process: reads the shared result and sends back a copy"""
+    reader = LogResultReader(name)
+    queue.put((reader.latest_version(), reader.read_frame()))
+    reader.close()
+
+class TestShareLogResults(unittest.TestCase):
+    """
+    Unit tests for sharing the cleaned log data through shared memory.
+    Uses a small log data frame like the one in log.csv.
+    """
+
+    def setUp(self):
+        """Create a publisher with a unique name and some cleaned log data"""
+        self.name = f"test_log_results_{os.getpid()}"
+        self.publisher = LogResultPublisher(self.name)
+        self.log_data = process_log_data(pd.DataFrame({
+            'Time': [17544, 17600, 17620, 17630],
+            'Endpoint': ['/login', '/profile', '/api/data', '/login'],
+            'HTTPMethod': ['POST', 'GET', 'POST', 'GET'],
+            'Login': [None, 'user456', 'admin', None],
+            'IPAddr': ['115.91.249.13', '212.91.249.2', '115.91.249.15', '115.91.249.20'],
+            'ResponseMS': [928, 150, 432, 321],
+            'ResponseCode': [200, 500, 500, 500],
+        }))
+
+    def tearDown(self):
+        """Remove the shared memory"""
+        self.publisher.close()
+
+    def test_read_matches_published_frame(self):
+        """Test that the reader gets back the same data frame"""
+        self.publisher.publish(self.log_data)
+        reader = LogResultReader(self.name)
+        log_data = reader.read_frame()
+        reader.close()
+        pd.testing.assert_frame_equal(log_data, self.log_data.reset_index(drop=True),
+                                      check_dtype=False)
+
+    def test_arrays_view_shared_memory(self):
+        """Test that read() gives arrays that use the shared memory directly"""
+        self.publisher.publish(self.log_data)
+        reader = LogResultReader(self.name)
+        arrays = reader.read()
+        self.assertEqual(arrays['Time'].tolist(), [17630, 17620, 17600])
+        self.assertEqual(arrays['HTTPCall'].tolist(), ['GET /login', 'POST /api/data', 'GET /profile'])
+        # The array does not own its data, it points into the shared block
+        self.assertFalse(arrays['Time'].flags['OWNDATA'])
+        del arrays
+        reader.close()
+
+    def test_versions(self):
+        """Test that a reader can tell when a new result was published"""
+        reader = LogResultReader(self.name)
+        self.assertEqual(reader.latest_version(), 0)
+        self.assertIsNone(reader.read())
+
+        self.publisher.publish(self.log_data)
+        self.assertTrue(reader.has_new_result())
+        reader.read_frame()
+        self.assertFalse(reader.has_new_result())
+
+        # Publish a few more times, older blocks get removed along the way
+        for _ in range(3):
+            self.publisher.publish(self.log_data.head(1))
+        self.assertEqual(reader.latest_version(), 4)
+        self.assertTrue(reader.has_new_result())
+        self.assertEqual(len(reader.read_frame()), 1)
+        self.assertEqual(reader.version, 4)
+        reader.close()
+
+    def test_other_process(self):
+        """Test reading the result from a separate process"""
+        self.publisher.publish(self.log_data)
+        context = multiprocessing.get_context('spawn')
+        queue = context.Queue()
+        process = context.Process(target=read_in_other_process, args=(self.name, queue))
+        process.start()
+        version, log_data = queue.get(timeout=30)
+        process.join()
+        self.assertEqual(version, 1)
+        pd.testing.assert_frame_equal(log_data, self.log_data.reset_index(drop=True),
+                                      check_dtype=False)
+        # The other process exiting must not remove our shared memory
+        reader = LogResultReader(self.name)
+        self.assertEqual(len(reader.read_frame()), 3)
+        reader.close()
+
+    def test_old_arrays_after_new_read(self):
+        """Test that arrays from an earlier read() still work after newer results"""
+        self.publisher.publish(self.log_data)
+        reader = LogResultReader(self.name)
+        old = reader.read()
+        old_slice = old['Time'][1:]
+        # Publish enough times that the publisher removes the old block
+        for _ in range(3):
+            self.publisher.publish(self.log_data.head(1))
+        new = reader.read()
+        self.assertEqual(old['Time'].tolist(), [17630, 17620, 17600])
+        self.assertEqual(old_slice.tolist(), [17620, 17600])
+        self.assertEqual(old['Login'].tolist(), ['', 'admin', 'user456'])
+        self.assertEqual(new['Time'].tolist(), [17630])
+        # Arrays also keep working after the reader is closed
+        reader.close()
+        self.assertEqual(old['Time'].tolist(), [17630, 17620, 17600])
+        self.assertEqual(new['HTTPCall'][0], 'GET /login')
+
+    def test_unused_blocks_are_closed(self):
+        """Test that a block is closed once no array from it is left"""
+        self.publisher.publish(self.log_data)
+        reader = LogResultReader(self.name)
+        arrays = reader.read()
+        self.assertEqual(share_log_results.released_blocks, [])
+        del arrays
+        gc.collect()
+        self.assertEqual(len(share_log_results.released_blocks), 1)
+        reader.read_frame()
+        reader.close()
+        self.assertEqual(share_log_results.released_blocks, [])
+
+    def test_strings_are_not_padded(self):
+        """Test that one long string doesn't make every row take up that much space"""
+        log_data = pd.concat([self.log_data] * 100, ignore_index=True)
+        log_data.loc[0, 'HTTPCall'] = 'GET /' + 'x' * 2000
+        log_data.loc[1, 'Login'] = 'jürgen'
+        descriptor = self.publisher.publish(log_data)
+        sizes = {info['name']: info['length'] for info in descriptor['buffers']}
+        self.assertEqual(sizes['HTTPCall.data'], sum(len(call.encode()) for call in log_data['HTTPCall']))
+        self.assertEqual(sizes['HTTPCall.offsets'], len(log_data) + 1)
+
+        reader = LogResultReader(self.name)
+        arrays = reader.read()
+        self.assertEqual(len(arrays['HTTPCall'][0]), 2005)
+        self.assertEqual(arrays['Login'][1], 'jürgen')
+        self.assertEqual(len(arrays['Login']), 300)
+        del arrays
+        reader.close()
+
+    def test_login_not_read_as_text(self):
+        """Test publishing a Login column that read_csv gave as numbers or all empty"""
+        log_data = self.log_data.copy()
+        # read_csv gives a float64 column when every Login is empty
+        log_data['Login'] = pd.Series([None, None, None], index=log_data.index, dtype='float64')
+        self.publisher.publish(log_data)
+        reader = LogResultReader(self.name)
+        self.assertTrue(reader.read_frame()['Login'].isna().all())
+
+        log_data['Login'] = pd.Series([1001, None, 1003], index=log_data.index, dtype='float64')
+        self.publisher.publish(log_data)
+        self.assertEqual(reader.read()['Login'].tolist(), ['1001.0', '', '1003.0'])
+        reader.close()
+
+    def test_publisher_restart(self):
+        """Test that a new publisher can take over after one stopped without close()"""
+        self.publisher.publish(self.log_data)
+        crashed = self.publisher
+        self.publisher = LogResultPublisher(self.name)
+        reader = LogResultReader(self.name)
+        # The old result is still there until the new publisher publishes
+        self.assertEqual(reader.latest_version(), 1)
+        self.assertEqual(len(reader.read_frame()), 3)
+        self.publisher.publish(self.log_data.head(1))
+        self.assertEqual(reader.latest_version(), 2)
+        self.assertEqual(len(reader.read_frame()), 1)
+        reader.close()
+        # Let go of the crashed publisher's memory without removing anything
+        del crashed.header
+        crashed.control.close()
+        for block in crashed.blocks:
+            block.close()
+
+    def test_publisher_restart_while_writing(self):
+        """Test taking over from a publisher that stopped in the middle of publishing"""
+        self.publisher.publish(self.log_data)
+        crashed = self.publisher
+        crashed.header[0] += 1
+        self.publisher = LogResultPublisher(self.name)
+        reader = LogResultReader(self.name)
+        self.assertIsNone(reader.read())
+        self.publisher.publish(self.log_data)
+        self.assertEqual(len(reader.read_frame()), 3)
+        reader.close()
+        del crashed.header
+        crashed.control.close()
+        for block in crashed.blocks:
+            block.close()
+            block.unlink()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,152 @@
 import numpy as np
 
-def solveEqns(eqn1, eqn2):
+# Products used by Cramer's rule must stay below this size, so that
+# "a * b - c * d" always fits inside a 64-bit NumPy integer.
+# It is 2^61 instead of 2^62 to leave room for the float estimate's rounding.
+INT64_SAFE_PRODUCT = 2.0**61
+
+def get_coefficients(equation):
+    """Gets the coefficients (a, b, c) from an equation string"""
+    # Clean up the equation by removing newlines and extra spaces
+    equation = equation.replace('\n', ' ')
+    # Make sure we have single spaces between parts
+    equation = ' '.join(equation.split())
+    
+    # Split into left and right sides
+    left_side, right_side = equation.split('=')
+    left_side = left_side.strip()
+    right_side = right_side.strip()
+    
+    # Get c (the right side number)
+    c = int(right_side)
+    
+    # Initialize coefficients
+    a = 0  # coefficient of x
+    b = 0  # coefficient of y
+    
+    # Split left side into parts
+    parts = left_side.split('+')
+    
+    # Look at each part (term)
+    for part in parts:
+        part = part.strip()
+        if 'x' in part:
+            # This part has x
+            number = part.replace('x', '').strip()
+            if number == '':
+                a = 1
+            else:
+                a = int(number)
+        elif 'y' in part:
+            # This part has y
+            number = part.replace('y', '').strip()
+            if number == '':
+                b = 1
+            else:
+                b = int(number)
+    
+    return a, b, c
+
+
+def cramer_rule(coefficients):
+    """
+    Solves every row of coefficients at once using Cramer's rule.
+    Works with int64 arrays (fast) and object arrays of Python ints (any size).
+    
+    Args:
+        coefficients (np.ndarray): Rows of (a1, b1, c1, a2, b2, c2)
+    
+    Returns:
+        tuple: (numerators, denominators), each with one row per system
+               and two columns (x, y), in lowest terms
+    """
+    # Get one column for each coefficient
+    a1, b1, c1, a2, b2, c2 = coefficients.T
+    
+    # Cramer's rule: x = (c1*b2 - c2*b1) / det and y = (a1*c2 - a2*c1) / det
+    det = a1 * b2 - a2 * b1
+    x_num = c1 * b2 - c2 * b1
+    y_num = a1 * c2 - a2 * c1
+    
+    # Same error that np.linalg.solve gives when there is no single answer
+    if (det == 0).any():
+        raise np.linalg.LinAlgError("Singular matrix")
+    
+    # Keep the denominator positive by moving the sign to the numerator
+    sign = np.where(det < 0, -1, 1)
+    det = det * sign
+    numerators = np.stack([x_num * sign, y_num * sign], axis=1)
+    denominators = np.stack([det, det], axis=1)
+    
+    # Reduce each fraction to lowest terms
+    divisor = np.gcd(numerators, denominators)
+    return numerators // divisor, denominators // divisor
+
+
+def solveEqnsExact(coefficients):
+    """
+    Solves many systems of two linear equations exactly, with no floats.
+    Rows whose products a * b fit in int64 are solved with fast int64 math.
+    Only the rows that would overflow int64 are solved with Python's big ints.
+    
+    Args:
+        coefficients: Rows of (a1, b1, c1, a2, b2, c2), for example a list of
+                      get_coefficients(eqn1) + get_coefficients(eqn2) tuples
+    
+    Returns:
+        tuple: (numerators, denominators) arrays with shape (number of systems, 2).
+               Row i holds x = numerators[i, 0] / denominators[i, 0]
+               and y = numerators[i, 1] / denominators[i, 1].
+               The arrays are int64 if no row overflows. If even one row needs
+               big ints, both arrays of the whole batch are object (Python ints),
+               since a NumPy array can only hold one type.
+    
+    Raises:
+        ValueError: If a coefficient is not an integer
+    """
+    array = np.asarray(coefficients)
+    if array.dtype.kind != 'i':
+        # Build the array again from the original values, so numbers too big for
+        # int64 stay exact Python ints instead of being turned into floats
+        array = np.array(coefficients, dtype=object)
+        for value in array.flat:
+            if not isinstance(value, (int, np.integer)) or isinstance(value, bool):
+                raise ValueError(f"Coefficients must be integers, got {value!r}")
+    coefficients = array
+    
+    if coefficients.ndim != 2 or coefficients.shape[1] != 6:
+        if coefficients.size == 0:
+            # No systems to solve
+            empty = np.zeros((0, 2), dtype=np.int64)
+            return empty, empty.copy()
+        raise ValueError("Each row must hold 6 coefficients (a1, b1, c1, a2, b2, c2)")
+    
+    # Quick check: when every coefficient is below 2^31, no product can overflow
+    if coefficients.dtype.kind == 'i' and -2**31 < coefficients.min() and coefficients.max() < 2**31:
+        return cramer_rule(coefficients.astype(np.int64))
+    
+    # Find the rows that can safely use int64 math by estimating the size of
+    # every product Cramer's rule makes with floats (too-big values become inf)
+    with np.errstate(over='ignore'):
+        sizes = np.abs(coefficients.astype(np.float64))
+        a1, b1, c1, a2, b2, c2 = sizes.T
+        products = np.stack([a1 * b2, a2 * b1, c1 * b2, c2 * b1, a1 * c2, a2 * c1], axis=1)
+    fits = ((products < INT64_SAFE_PRODUCT).all(axis=1) &
+            (sizes < INT64_SAFE_PRODUCT).all(axis=1))
+    
+    # Fast path: every row fits, so everything stays int64
+    if fits.all():
+        return cramer_rule(coefficients.astype(np.int64))
+    
+    # Otherwise solve the two groups of rows separately and put them back together
+    numerators = np.empty((len(coefficients), 2), dtype=object)
+    denominators = np.empty((len(coefficients), 2), dtype=object)
+    numerators[fits], denominators[fits] = cramer_rule(coefficients[fits].astype(np.int64))
+    numerators[~fits], denominators[~fits] = cramer_rule(coefficients[~fits].astype(object))
+    return numerators, denominators
+
+
+def solveEqns(eqn1, eqn2, exact=False):
     """
     Solves a system of two linear equations in the form "a x + b y = c".
     Assumes all coefficients (a, b, c) are non-negative integers.
@@ -8,56 +154,22 @@ def solveEqns(eqn1, eqn2):
     Args:
         eqn1 (str): First equation in the form "a x + b y = c"
         eqn2 (str): Second equation in the form "a x + b y = c"
+        exact (bool): If True, return exact fractions instead of floats
     
     Returns:
-        tuple: Solution (x, y) as a 2-element tuple of float values
+        tuple: Solution (x, y) as a 2-element tuple of float values,
+               or of (numerator, denominator) int pairs when exact is True
     """
-    def get_coefficients(equation):
-        """Gets the coefficients (a, b, c) from an equation string"""
-        # Clean up the equation by removing newlines and extra spaces
-        equation = equation.replace('\n', ' ')
-        # Make sure we have single spaces between parts
-        equation = ' '.join(equation.split())
-        
-        # Split into left and right sides
-        left_side, right_side = equation.split('=')
-        left_side = left_side.strip()
-        right_side = right_side.strip()
-        
-        # Get c (the right side number)
-        c = int(right_side)
-        
-        # Initialize coefficients
-        a = 0  # coefficient of x
-        b = 0  # coefficient of y
-        
-        # Split left side into parts
-        parts = left_side.split('+')
-        
-        # Look at each part (term)
-        for part in parts:
-            part = part.strip()
-            if 'x' in part:
-                # This part has x
-                number = part.replace('x', '').strip()
-                if number == '':
-                    a = 1
-                else:
-                    a = int(number)
-            elif 'y' in part:
-                # This part has y
-                number = part.replace('y', '').strip()
-                if number == '':
-                    b = 1
-                else:
-                    b = int(number)
-        
-        return a, b, c
-    
     # Get coefficients from both equations
     a1, b1, c1 = get_coefficients(eqn1)
     a2, b2, c2 = get_coefficients(eqn2)
     
+    if exact:
+        # Solve with whole numbers only and return (numerator, denominator) pairs
+        numerators, denominators = solveEqnsExact([[a1, b1, c1, a2, b2, c2]])
+        return ((int(numerators[0, 0]), int(denominators[0, 0])),
+                (int(numerators[0, 1]), int(denominators[0, 1])))
+    
     # Use NumPy to solve the system of equations
     A = np.array([[a1, b1], [a2, b2]])
     B = np.array([c1, c2])
@@ -1,6 +1,7 @@
 import unittest
 import numpy as np
-from solve_linear_eqns import solveEqns
+from fractions import Fraction
+from solve_linear_eqns import solveEqns, solveEqnsExact
 
 class TestLinearEquationSolver(unittest.TestCase):
     """
@@ -55,6 +56,88 @@ class TestLinearEquationSolver(unittest.TestCase):
         x, y = solveEqns(eqn1, eqn2)
         self.assertAlmostEqual(x, 1.0)
         self.assertAlmostEqual(y, 2.0)
+    
+    def test_exact_mode(self):
+        """Test that exact mode returns (numerator, denominator) pairs"""
+        x, y = solveEqns("2x + 3y = 8", "1x + 1y = 3", exact=True)
+        self.assertEqual(x, (1, 1))
+        self.assertEqual(y, (2, 1))
+        
+        # Answers with negative numerators and real fractions
+        x, y = solveEqns("x + 2y = 1", "3x + 4y = 0", exact=True)
+        self.assertEqual(x, (-2, 1))
+        self.assertEqual(y, (3, 2))
+        x, y = solveEqns("3x + 3y = 1", "x + 2y = 0", exact=True)
+        self.assertEqual(x, (2, 3))
+        self.assertEqual(y, (-1, 3))
+    
+    def test_exact_batch_matches_fractions(self):
+        """Test many systems at once against Python's Fraction class"""
+        rng = np.random.default_rng(0)
+        coefficients = rng.integers(1, 1000, size=(100, 6))
+        numerators, denominators = solveEqnsExact(coefficients)
+        self.assertEqual(numerators.dtype, np.int64)
+        for row, num, den in zip(coefficients.tolist(), numerators, denominators):
+            a1, b1, c1, a2, b2, c2 = row
+            det = a1 * b2 - a2 * b1
+            self.assertEqual(Fraction(int(num[0]), int(den[0])), Fraction(c1 * b2 - c2 * b1, det))
+            self.assertEqual(Fraction(int(num[1]), int(den[1])), Fraction(a1 * c2 - a2 * c1, det))
+            # Denominators are always positive
+            self.assertTrue(den[0] > 0 and den[1] > 0)
+    
+    def test_exact_batch_large_coefficients(self):
+        """Test that rows too big for int64 math still give exact answers"""
+        big = 2**40
+        coefficients = [[big, 1, 1, 1, big, 1],
+                        [2, 3, 8, 1, 1, 3]]
+        numerators, denominators = solveEqnsExact(coefficients)
+        # Both x and y equal (big - 1) / (big * big - 1) = 1 / (big + 1)
+        self.assertEqual(numerators[0].tolist(), [1, 1])
+        self.assertEqual(denominators[0].tolist(), [big + 1, big + 1])
+        # The small row is still solved correctly
+        self.assertEqual(numerators[1].tolist(), [1, 2])
+        self.assertEqual(denominators[1].tolist(), [1, 1])
+    
+    def test_exact_batch_big_coefficients_without_overflow(self):
+        """Test that big coefficients whose products still fit in int64 stay int64"""
+        coefficients = [[2**40, 0, 1, 0, 1, 1], [2, 3, 8, 1, 1, 3]]
+        numerators, denominators = solveEqnsExact(coefficients)
+        self.assertEqual(numerators.dtype, np.int64)
+        self.assertEqual(numerators.tolist(), [[1, 1], [1, 2]])
+        self.assertEqual(denominators.tolist(), [[2**40, 1], [1, 1]])
+    
+    def test_exact_batch_small_int_type(self):
+        """Test that int32 input doesn't overflow in the products"""
+        coefficients = np.array([[60000, 1, 1, 1, 60000, 1]], dtype=np.int32)
+        numerators, denominators = solveEqnsExact(coefficients)
+        self.assertEqual(Fraction(int(numerators[0, 0]), int(denominators[0, 0])), Fraction(1, 60001))
+    
+    def test_exact_batch_beyond_int64(self):
+        """Test coefficients between 2^63 and 2^64, which NumPy would turn into floats"""
+        big = 2**63 + 1
+        numerators, denominators = solveEqnsExact([[big, 1, 1, 1, 1, 3]])
+        # det = 2^63, so x = -2 / 2^63 and y = (3 * big - 1) / 2^63
+        self.assertEqual(Fraction(numerators[0, 0], denominators[0, 0]), Fraction(-2, 2**63))
+        self.assertEqual(Fraction(numerators[0, 1], denominators[0, 1]), Fraction(3 * big - 1, 2**63))
+        self.assertIsInstance(numerators[0, 0], int)
+    
+    def test_exact_batch_rejects_non_integers(self):
+        """Test that float coefficients raise an error instead of being cut off"""
+        with self.assertRaises(ValueError):
+            solveEqnsExact([[1.5, 1, 1, 1, 1, 1]])
+        with self.assertRaises(ValueError):
+            solveEqnsExact(np.array([[2.0, 3.0, 8.0, 1.0, 1.0, 3.0]]))
+    
+    def test_exact_batch_empty(self):
+        """Test that no systems give empty answers"""
+        numerators, denominators = solveEqnsExact([])
+        self.assertEqual(numerators.shape, (0, 2))
+        self.assertEqual(denominators.shape, (0, 2))
+    
+    def test_exact_singular_system(self):
+        """Test that exact mode raises the same error as np.linalg.solve"""
+        with self.assertRaises(np.linalg.LinAlgError):
+            solveEqns("1x + 2y = 3", "2x + 4y = 6", exact=True)
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file